@@ -970,7 +970,10 @@ def infinite_image_browsing_api(app: FastAPI, **kwargs):
         conn = DataBase.get_conn()
         for path in req.paths:
             check_path_trust(path)
-            FolderStats.clear_cache(conn, path)
+        # Batch all clears into one transaction (single fsync)
+        for path in req.paths:
+            FolderStats.clear_cache(conn, path, commit=False)
+        conn.commit()
         return {"cleared": len(req.paths)}
 
     @app.delete(stats_api_base + "/cache/all", dependencies=[Depends(verify_secret), Depends(write_permission_required)])
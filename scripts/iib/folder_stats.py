@@ -1,9 +1,14 @@
 import os
 import re
-from typing import Dict, List, Set, Optional
+import stat as stat_module
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
 from scripts.iib.db.datamodel import DataBase, FolderStats, Image, ImageTag, Tag, GlobalSetting
-from scripts.iib.tool import is_media_file, is_valid_media_path, get_video_type
+from scripts.iib.tool import MEDIA_EXTENSIONS, VIDEO_EXTENSIONS
 from scripts.iib.logger import logger
 import json
 
@@ -21,18 +26,171 @@ DEFAULT_STOPWORDS = [
 
 STOPWORDS_SETTING_KEY = "folder_stats_stopwords"
 
+# In-flight computations keyed by folder path, used by
+# get_cached_or_compute_stats to coalesce duplicate concurrent requests
+_inflight_lock = threading.Lock()
+_inflight_computes: Dict[str, threading.Event] = {}
+# How long a waiter trusts the owning thread before computing on its own.
+# Generous, since a cold walk of a huge network mount can take minutes
+_INFLIGHT_WAIT_TIMEOUT = 300.0  # seconds
 
-def get_stopwords(conn) -> Set[str]:
+# Precompiled at import time: these run once per exif blob (or more), and
+# going through re.findall/re.search would pay the pattern-cache lookup on
+# every call.
+_WORD_RE = re.compile(r'\b[a-z0-9][\w-]*\b')
+
+# One alternation per category so each exif blob is scanned once instead of
+# once per candidate pattern
+_MODEL_RE = re.compile(r'"model":\s*"([^"]+)"|Model:\s*([^\n,]+)', re.IGNORECASE)
+_SIZE_RE = re.compile(
+    r'"size":\s*"(\d+x\d+)"|Size:\s*(\d+x\d+)|(\d{3,5}x\d{3,5})',  # last: generic WxH
+    re.IGNORECASE,
+)
+
+
+def _path_prefix_range(folder_path: str):
+    """
+    Build a (lower, upper) bound pair matching every path under folder_path.
+
+    `path >= lower AND path < upper` is equivalent to `path LIKE 'folder/%'`
+    but lets SQLite serve it as a range scan on the image(path) index instead
+    of falling back to a full table scan.
+    """
+    lower = os.path.normpath(folder_path) + os.sep
+    upper = lower[:-1] + chr(ord(lower[-1]) + 1)
+    return lower, upper
+
+
+def _folder_image_filter_sql(folder_path: str, recursive: bool):
+    """
+    WHERE fragment and params selecting image rows under a folder.
+
+    Used to scope tag queries inside an imgs CTE so they never build
+    per-image IN lists (which re-parse huge SQL strings and can exceed
+    SQLITE_MAX_VARIABLE_NUMBER on large folders).
+    """
+    path_lo, path_hi = _path_prefix_range(folder_path)
+    where = "path >= ? AND path < ?"
+    params = [path_lo, path_hi]
+    if not recursive:
+        # Direct children only: no separator after the folder prefix
+        where += " AND instr(substr(path, ?), ?) = 0"
+        params += [len(path_lo) + 1, os.sep]
+    return where, params
+
+
+def _folder_image_ids_cte(folder_path: str, recursive: bool, limit: Optional[int]):
+    """
+    SELECT statement and params yielding the image ids under a folder,
+    for use as an imgs CTE body.
+
+    The date sort only exists to pick the most recent N rows, so it is
+    emitted solely when a limit applies — an unbounded query streams
+    straight off the path index without a sort step. The limited variant
+    still sorts (a path range can't yield date order), but
+    image_idx_path_date covers it: id and date are read off the index
+    with no per-row table lookup before the sort.
+    """
+    where, params = _folder_image_filter_sql(folder_path, recursive)
+    if limit:
+        sql = f"SELECT id FROM image WHERE {where} ORDER BY date DESC LIMIT ?"
+        params = params + [limit]
+    else:
+        sql = f"SELECT id FROM image WHERE {where}"
+    return sql, params
+
+
+def _fetch_folder_image_rows(
+    conn, folder_path: str, recursive: bool = True, limit: Optional[int] = None,
+    exif_only: bool = False
+) -> List[Tuple]:
+    """
+    Fetch (id, path, exif) rows for every indexed image under a folder.
+
+    Shared by the stats helpers below so compute_folder_stats issues a
+    single image-table query instead of one per helper. exif_only spends
+    the limit on exif-bearing rows only, so the prompt/metadata analysis
+    isn't starved by newer uncaptioned images eating the budget.
+    """
+    folder_path = os.path.normpath(folder_path)
+    path_lo, path_hi = _path_prefix_range(folder_path)
+
+    where = "path >= ? AND path < ?"
+    params = [path_lo, path_hi]
+    if not recursive and limit:
+        # With a LIMIT the direct-child filter must run in SQL before it,
+        # matching _folder_image_filter_sql: limiting first would spend
+        # the budget on nested rows and diverge from the tag-count CTE,
+        # which filters before limiting
+        where += " AND instr(substr(path, ?), ?) = 0"
+        params += [len(path_lo) + 1, os.sep]
+    if exif_only:
+        # Matches the image_idx_path_date_exif partial index predicate
+        where += " AND exif IS NOT NULL AND exif != ''"
+
+    with closing(conn.cursor()) as cur:
+        if limit:
+            cur.execute(f"""
+                SELECT id, path, exif FROM image
+                WHERE {where}
+                ORDER BY date DESC
+                LIMIT ?
+            """, params + [limit])
+        else:
+            cur.execute(f"""
+                SELECT id, path, exif FROM image
+                WHERE {where}
+            """, params)
+        # Drain in fixed-size batches rather than one big fetchall, keeping
+        # the row-construction working set cache-friendly on huge folders
+        cur.arraysize = 1000
+        rows = []
+        while True:
+            chunk = cur.fetchmany()
+            if not chunk:
+                break
+            rows.extend(chunk)
+
+    # Filter for non-recursive mode (only direct children). The range
+    # predicate guarantees every path starts with the folder prefix, so a
+    # direct child is simply one with no further separator after it — no
+    # per-row os.path.relpath needed. Limited queries already filtered in
+    # SQL above.
+    if not recursive and not limit:
+        plen = len(path_lo)
+        sep = os.sep
+        rows = [row for row in rows if sep not in row[1][plen:]]
+
+    return rows
+
+
+# Cached stopwords with a short TTL: every folder job queries them, and the
+# underlying setting rarely changes. save_stopwords invalidates eagerly.
+_STOPWORDS_CACHE = {"ts": 0.0, "value": None}
+_STOPWORDS_CACHE_TTL = 60  # seconds
+
+
+def get_stopwords(conn) -> FrozenSet[str]:
     """Get stopwords from settings or return default"""
+    cached = _STOPWORDS_CACHE["value"]
+    if cached is not None and time.time() - _STOPWORDS_CACHE["ts"] < _STOPWORDS_CACHE_TTL:
+        return cached
+
     setting = GlobalSetting.get_setting(conn, STOPWORDS_SETTING_KEY)
     if setting and isinstance(setting, list):
-        return set(word.lower() for word in setting)
-    return set(DEFAULT_STOPWORDS)
+        value = frozenset(word.lower() for word in setting)
+    else:
+        value = frozenset(DEFAULT_STOPWORDS)
+
+    _STOPWORDS_CACHE["value"] = value
+    _STOPWORDS_CACHE["ts"] = time.time()
+    return value
 
 
 def save_stopwords(conn, stopwords: List[str]):
     """Save stopwords to settings"""
     GlobalSetting.save_setting(conn, STOPWORDS_SETTING_KEY, json.dumps(stopwords))
+    _STOPWORDS_CACHE["value"] = None
 
 
 def extract_words_from_text(text: str, stopwords: Set[str], min_length: int = 2) -> List[str]:
@@ -51,7 +209,7 @@ def extract_words_from_text(text: str, stopwords: Set[str], min_length: int = 2)
         return []
     
     # Convert to lowercase and extract words (alphanumeric + hyphens)
-    words = re.findall(r'\b[a-z0-9][\w-]*\b', text.lower())
+    words = _WORD_RE.findall(text.lower())
     
     # Filter by length and stopwords
     filtered_words = [
@@ -62,14 +220,68 @@ def extract_words_from_text(text: str, stopwords: Set[str], min_length: int = 2)
     return filtered_words
 
 
-def get_file_and_folder_counts(folder_path: str, recursive: bool = True) -> Dict[str, int]:
+def _scan_dir(path: str):
+    """
+    Tally a single directory: (file_count, total_size, media_file_count, subdirs).
+
+    Per-directory unit of work for the parallel walk in
+    get_file_and_folder_counts; subdirs are returned so the caller can
+    schedule them as follow-up tasks.
+    """
+    file_count = 0
+    total_size = 0
+    media_file_count = 0
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    file_count += 1
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                    name = entry.name
+                    if '.' + name.rpartition('.')[2].lower() in MEDIA_EXTENSIONS:
+                        media_file_count += 1
+            except (OSError, FileNotFoundError):
+                pass
+    return file_count, total_size, media_file_count, subdirs
+
+
+def _positive_prompt_text(exif_data: str) -> str:
+    """
+    Slice the positive prompt off an exif blob with str.find (no discarded
+    split tails). The positive prompt ends at the "Negative prompt:" or
+    "Steps:" line.
+    """
+    end = exif_data.find('\nNegative prompt:')
+    if end == -1:
+        end = exif_data.find('\nSteps:')
+    return exif_data if end == -1 else exif_data[:end]
+
+
+def _prune_word_counts(word_counts: Counter, stopwords: Set[str], min_length: int = 2):
+    """
+    Drop stopwords and too-short words from an aggregated word Counter.
+
+    Filtering after aggregation touches each unique word once instead of
+    running an interpreted check per token, so the hot tokenize-and-count
+    loop stays entirely in C (regex findall + Counter.update).
+    """
+    for word in list(word_counts):
+        if len(word) < min_length or word in stopwords:
+            del word_counts[word]
+
+
+def get_file_and_folder_counts(folder_path: str, recursive: bool = True, stat_threads: int = 8) -> Dict[str, int]:
     """
     Count files and subfolders in a directory.
-    
+
     Args:
         folder_path: Path to the folder
         recursive: Whether to count recursively
-    
+        stat_threads: Worker threads for the recursive walk (stat calls release the GIL)
+
     Returns:
         Dictionary with counts
     """
@@ -88,17 +300,25 @@ def get_file_and_folder_counts(folder_path: str, recursive: bool = True) -> Dict
             }
         
         if recursive:
-            for root, dirs, files in os.walk(folder_path):
-                subfolder_count += len(dirs)
-                for file in files:
-                    file_count += 1
-                    file_path = os.path.join(root, file)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                        if is_media_file(file):
-                            media_file_count += 1
-                    except (OSError, FileNotFoundError):
-                        pass
+            # Parallel per-directory walk: each directory is one task, and
+            # discovered subdirectories are submitted as new tasks. The walk
+            # is I/O bound and stat/scandir release the GIL, so this scales
+            # with disk parallelism on slow (network) storage.
+            with ThreadPoolExecutor(max_workers=stat_threads) as executor:
+                pending = {executor.submit(_scan_dir, folder_path)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            files, size, media, subdirs = future.result()
+                        except (OSError, FileNotFoundError):
+                            continue
+                        file_count += files
+                        total_size += size
+                        media_file_count += media
+                        subfolder_count += len(subdirs)
+                        for subdir in subdirs:
+                            pending.add(executor.submit(_scan_dir, subdir))
         else:
             with os.scandir(folder_path) as entries:
                 for entry in entries:
@@ -106,7 +326,8 @@ def get_file_and_folder_counts(folder_path: str, recursive: bool = True) -> Dict
                         if entry.is_file():
                             file_count += 1
                             total_size += entry.stat().st_size
-                            if is_media_file(entry.name):
+                            name = entry.name
+                            if '.' + name.rpartition('.')[2].lower() in MEDIA_EXTENSIONS:
                                 media_file_count += 1
                         elif entry.is_dir():
                             subfolder_count += 1
@@ -124,57 +345,27 @@ def get_file_and_folder_counts(folder_path: str, recursive: bool = True) -> Dict
     }
 
 
-def get_media_stats(conn, folder_path: str, recursive: bool = True, limit: Optional[int] = None) -> Dict:
+def get_media_stats(conn, folder_path: str, recursive: bool = True, limit: Optional[int] = None, rows: Optional[List[Tuple]] = None) -> Dict:
     """
     Get statistics about media files in a folder from database.
-    
+
     Args:
         conn: Database connection
         folder_path: Path to the folder
         recursive: Whether to analyze recursively
         limit: Maximum number of images to analyze (None for unlimited)
-    
+        rows: Preloaded (id, path, exif) rows from _fetch_folder_image_rows
+
     Returns:
         Dictionary with media statistics
     """
     folder_path = os.path.normpath(folder_path)
-    
-    # Build path pattern for SQL LIKE query
-    path_pattern = folder_path + os.sep + "%"
-    
+
     try:
-        from contextlib import closing
-        
-        # Get all images in folder
-        with closing(conn.cursor()) as cur:
-            if limit:
-                # With limit
-                cur.execute("""
-                    SELECT id, path FROM image 
-                    WHERE path LIKE ? 
-                    ORDER BY date DESC
-                    LIMIT ?
-                """, (path_pattern, limit))
-            else:
-                # Without limit
-                cur.execute("""
-                    SELECT id, path FROM image 
-                    WHERE path LIKE ?
-                """, (path_pattern,))
-            
-            image_rows = cur.fetchall()
-        
-        # Filter for non-recursive mode (only direct children)
-        if not recursive:
-            filtered_rows = []
-            for row in image_rows:
-                img_path = row[1]
-                # Check if file is direct child (no additional path separators after folder_path)
-                rel_path = os.path.relpath(img_path, folder_path)
-                if os.sep not in rel_path and rel_path != '.':
-                    filtered_rows.append(row)
-            image_rows = filtered_rows
-        
+        if rows is None:
+            rows = _fetch_folder_image_rows(conn, folder_path, recursive, limit)
+        image_rows = rows
+
         image_ids = [row[0] for row in image_rows]
         total_images = len(image_ids)
         
@@ -190,20 +381,43 @@ def get_media_stats(conn, folder_path: str, recursive: bool = True, limit: Optio
             }
         
         # Count videos vs images
-        total_videos = sum(1 for row in image_rows if get_video_type(row[1]))
+        total_videos = sum(
+            1 for row in image_rows
+            if '.' + row[1].rpartition('.')[2].lower() in VIDEO_EXTENSIONS
+        )
         total_images_only = total_images - total_videos
-        
-        # Get tagged image count (only custom tags)
+
+        # Get tagged image count (only custom tags). Probe for any custom
+        # tag *assignment* first: create_table always seeds a custom "like"
+        # tag, so the tag table alone is never empty, but libraries where
+        # nothing has been tagged skip the CTE query entirely
+        tagged_count = 0
         with closing(conn.cursor()) as cur:
-            placeholders = ','.join('?' * len(image_ids))
-            cur.execute(f"""
-                SELECT COUNT(DISTINCT it.image_id) 
-                FROM image_tag it
+            cur.execute("""
+                SELECT 1 FROM image_tag it
                 JOIN tag t ON it.tag_id = t.id
-                WHERE it.image_id IN ({placeholders})
-                AND t.type = 'custom'
-            """, image_ids)
-            tagged_count = cur.fetchone()[0]
+                WHERE t.type = 'custom' LIMIT 1
+            """)
+            has_custom_tags = cur.fetchone() is not None
+
+        if has_custom_tags:
+            imgs_sql, imgs_params = _folder_image_ids_cte(folder_path, recursive, limit)
+            with closing(conn.cursor()) as cur:
+                # GROUP BY instead of COUNT(DISTINCT): image_tag's
+                # (image_id, tag_id) primary key already guarantees unique
+                # pairs, so grouping streams off the index without a dedup pass
+                cur.execute(f"""
+                    WITH imgs AS ({imgs_sql})
+                    SELECT COUNT(*) FROM (
+                        SELECT it.image_id
+                        FROM image_tag it
+                        JOIN tag t ON it.tag_id = t.id
+                        JOIN imgs ON imgs.id = it.image_id
+                        WHERE t.type = 'custom'
+                        GROUP BY it.image_id
+                    )
+                """, imgs_params)
+                tagged_count = cur.fetchone()[0]
         
         return {
             "total_images": total_images_only,
@@ -232,78 +446,42 @@ def get_media_stats(conn, folder_path: str, recursive: bool = True, limit: Optio
 def get_top_tags(conn, folder_path: str, recursive: bool = True, limit: int = 10, max_images: Optional[int] = None) -> List[Dict]:
     """
     Get most frequently used tags in a folder.
-    
+
     Args:
         conn: Database connection
         folder_path: Path to the folder
         recursive: Whether to analyze recursively
         limit: Number of top tags to return
         max_images: Maximum number of images to analyze
-    
+
     Returns:
         List of tag dictionaries with counts
     """
     folder_path = os.path.normpath(folder_path)
-    path_pattern = folder_path + os.sep + "%"
-    
+
     try:
-        from contextlib import closing
-        
-        # Get images in folder with optional limit
+        # Get tag counts (only custom tags) in a single query: folder
+        # scoping, grouping and Top-N all happen inside SQLite
+        imgs_sql, imgs_params = _folder_image_ids_cte(folder_path, recursive, max_images)
         with closing(conn.cursor()) as cur:
-            if max_images:
-                cur.execute("""
-                    SELECT id, path FROM image 
-                    WHERE path LIKE ? 
-                    ORDER BY date DESC
-                    LIMIT ?
-                """, (path_pattern, max_images))
-            else:
-                cur.execute("""
-                    SELECT id, path FROM image 
-                    WHERE path LIKE ?
-                """, (path_pattern,))
-            
-            image_rows = cur.fetchall()
-        
-        # Filter for non-recursive
-        if not recursive:
-            filtered_rows = []
-            for row in image_rows:
-                img_path = row[1]
-                rel_path = os.path.relpath(img_path, folder_path)
-                if os.sep not in rel_path and rel_path != '.':
-                    filtered_rows.append(row)
-            image_rows = filtered_rows
-        
-        image_ids = [row[0] for row in image_rows]
-        
-        if not image_ids:
-            logger.info(f"No images found for tags in folder {folder_path}")
-            return []
-        
-        logger.info(f"Found {len(image_ids)} images for tag analysis in {folder_path}")
-        
-        # Get tag counts (only custom tags)
-        with closing(conn.cursor()) as cur:
-            placeholders = ','.join('?' * len(image_ids))
             cur.execute(f"""
-                SELECT 
-                    tag.id, 
-                    tag.name, 
+                WITH imgs AS ({imgs_sql})
+                SELECT
+                    tag.id,
+                    tag.name,
                     tag.type,
                     COUNT(*) as count
                 FROM image_tag
                 INNER JOIN tag ON image_tag.tag_id = tag.id
-                WHERE image_tag.image_id IN ({placeholders})
-                AND tag.type = 'custom'
+                INNER JOIN imgs ON imgs.id = image_tag.image_id
+                WHERE tag.type = 'custom'
                 GROUP BY tag.id
                 ORDER BY count DESC
                 LIMIT ?
-            """, image_ids + [limit])
-            
+            """, imgs_params + [limit])
+
             rows = cur.fetchall()
-        
+
         logger.info(f"Found {len(rows)} tags for folder {folder_path}")
         
         total_tags = sum(row[3] for row in rows)
@@ -324,88 +502,50 @@ def get_top_tags(conn, folder_path: str, recursive: bool = True, limit: int = 10
         return []
 
 
-def analyze_prompt_words(conn, folder_path: str, recursive: bool = True, limit: int = 20, max_images: Optional[int] = None) -> Dict:
+def analyze_prompt_words(conn, folder_path: str, recursive: bool = True, limit: int = 20, max_images: Optional[int] = None, rows: Optional[List[Tuple]] = None) -> Dict:
     """
     Analyze word frequency in image prompts.
-    
+
     Args:
         conn: Database connection
         folder_path: Path to the folder
         recursive: Whether to analyze recursively
         limit: Number of top words to return
         max_images: Maximum number of images to analyze
-    
+        rows: Preloaded (id, path, exif) rows from _fetch_folder_image_rows
+
     Returns:
         Dictionary with word frequency analysis
     """
     folder_path = os.path.normpath(folder_path)
-    path_pattern = folder_path + os.sep + "%"
     stopwords = get_stopwords(conn)
-    
+
     try:
-        from contextlib import closing
-        
-        # Get images with exif data
-        with closing(conn.cursor()) as cur:
-            if max_images:
-                cur.execute("""
-                    SELECT path, exif FROM image 
-                    WHERE path LIKE ? AND exif IS NOT NULL AND exif != ''
-                    ORDER BY date DESC
-                    LIMIT ?
-                """, (path_pattern, max_images))
-            else:
-                cur.execute("""
-                    SELECT path, exif FROM image 
-                    WHERE path LIKE ? AND exif IS NOT NULL AND exif != ''
-                """, (path_pattern,))
-            
-            rows = cur.fetchall()
-        
-        # Filter for non-recursive
-        if not recursive:
-            filtered_rows = []
-            for row in rows:
-                img_path = row[0]
-                rel_path = os.path.relpath(img_path, folder_path)
-                if os.sep not in rel_path and rel_path != '.':
-                    filtered_rows.append(row)
-            rows = filtered_rows
-        
+        if rows is None:
+            rows = _fetch_folder_image_rows(conn, folder_path, recursive, max_images, exif_only=True)
+
         if not rows:
             return {
                 "total_prompts_analyzed": 0,
                 "top_words": []
             }
-        
-        # Collect all words from prompts
-        all_words = []
+
+        # Count words from prompts incrementally
+        prompts_analyzed = 0
+        word_counts = Counter()
         for row in rows:
-            exif_data = row[1]
+            exif_data = row[2]
             if exif_data:
-                # Extract only the positive prompt (before "Negative prompt:" or newline with "Steps:")
-                # Format: "positive prompt\nNegative prompt: ...\nSteps: ..."
-                prompt_text = exif_data
-                
-                # Stop at "Negative prompt:" line
-                if '\nNegative prompt:' in prompt_text:
-                    prompt_text = prompt_text.split('\nNegative prompt:')[0]
-                # Or stop at "Steps:" line
-                elif '\nSteps:' in prompt_text:
-                    prompt_text = prompt_text.split('\nSteps:')[0]
-                
-                # Extract words only from the positive prompt
-                words = extract_words_from_text(prompt_text, stopwords)
-                all_words.extend(words)
-        
-        # Count word frequency
-        word_counts = Counter(all_words)
+                prompts_analyzed += 1
+                word_counts.update(_WORD_RE.findall(_positive_prompt_text(exif_data).lower()))
+
+        _prune_word_counts(word_counts, stopwords)
         top_words = word_counts.most_common(limit)
-        
+
         total_words = sum(word_counts.values())
         
         return {
-            "total_prompts_analyzed": len(rows),
+            "total_prompts_analyzed": prompts_analyzed,
             "total_words_found": len(word_counts),
             "top_words": [
                 {
@@ -426,7 +566,7 @@ def analyze_prompt_words(conn, folder_path: str, recursive: bool = True, limit:
         }
 
 
-def get_metadata_summary(conn, folder_path: str, recursive: bool = True, max_images: Optional[int] = None) -> Dict:
+def get_metadata_summary(conn, folder_path: str, recursive: bool = True, max_images: Optional[int] = None, rows: Optional[List[Tuple]] = None) -> Dict:
     """
     Get summary of metadata (models, image sizes) from images in folder.
     
@@ -435,80 +575,36 @@ def get_metadata_summary(conn, folder_path: str, recursive: bool = True, max_ima
         folder_path: Path to the folder
         recursive: Whether to analyze recursively
         max_images: Maximum number of images to analyze
-    
+        rows: Preloaded (id, path, exif) rows from _fetch_folder_image_rows
+
     Returns:
         Dictionary with metadata summaries
     """
     folder_path = os.path.normpath(folder_path)
-    path_pattern = folder_path + os.sep + "%"
-    
+
     try:
-        from contextlib import closing
-        
-        # Get images in folder
-        with closing(conn.cursor()) as cur:
-            if max_images:
-                cur.execute("""
-                    SELECT path, exif FROM image 
-                    WHERE path LIKE ? AND exif IS NOT NULL AND exif != ''
-                    ORDER BY date DESC
-                    LIMIT ?
-                """, (path_pattern, max_images))
-            else:
-                cur.execute("""
-                    SELECT path, exif FROM image 
-                    WHERE path LIKE ? AND exif IS NOT NULL AND exif != ''
-                """, (path_pattern,))
-            
-            rows = cur.fetchall()
-        
-        # Filter for non-recursive
-        if not recursive:
-            filtered_rows = []
-            for row in rows:
-                img_path = row[0]
-                rel_path = os.path.relpath(img_path, folder_path)
-                if os.sep not in rel_path and rel_path != '.':
-                    filtered_rows.append(row)
-            rows = filtered_rows
-        
+        if rows is None:
+            rows = _fetch_folder_image_rows(conn, folder_path, recursive, max_images, exif_only=True)
+
         models = Counter()
         sizes = Counter()
-        
+
         for row in rows:
-            exif_data = row[1]
+            exif_data = row[2]
             if not exif_data:
                 continue
             
             # Try to extract model name (common patterns)
-            model_patterns = [
-                r'Model:\s*([^\n,]+)',
-                r'model:\s*([^\n,]+)',
-                r'"model":\s*"([^"]+)"',
-            ]
-            
-            for pattern in model_patterns:
-                match = re.search(pattern, exif_data, re.IGNORECASE)
-                if match:
-                    model_name = match.group(1).strip()
-                    if model_name:
-                        models[model_name] += 1
-                        break
-            
+            match = _MODEL_RE.search(exif_data)
+            if match:
+                model_name = (match.group(1) or match.group(2)).strip()
+                if model_name:
+                    models[model_name] += 1
+
             # Try to extract image size
-            size_patterns = [
-                r'Size:\s*(\d+x\d+)',
-                r'size:\s*(\d+x\d+)',
-                r'"size":\s*"(\d+x\d+)"',
-                r'(\d{3,5}x\d{3,5})',  # Generic WxH pattern
-            ]
-            
-            for pattern in size_patterns:
-                match = re.search(pattern, exif_data, re.IGNORECASE)
-                if match:
-                    size = match.group(1)
-                    sizes[size] += 1
-                    break
+            match = _SIZE_RE.search(exif_data)
+            if match:
+                sizes[match.group(1) or match.group(2) or match.group(3)] += 1
         
         return {
             "models": dict(models.most_common(10)),
@@ -525,46 +621,85 @@ def get_metadata_summary(conn, folder_path: str, recursive: bool = True, max_ima
 
 
 def compute_folder_stats(
-    folder_path: str, 
-    recursive: bool = True, 
+    folder_path: str,
+    recursive: bool = True,
     include_metadata: bool = True,
-    analysis_limit: Optional[int] = None
+    analysis_limit: Optional[int] = None,
+    skip_fs_walk: bool = False,
+    root_stat: Optional[os.stat_result] = None,
+    conn=None
 ) -> Dict:
     """
     Compute comprehensive statistics for a folder.
-    
+
     Args:
         folder_path: Path to the folder
         recursive: Whether to analyze recursively
         include_metadata: Whether to include detailed metadata analysis
         analysis_limit: Maximum number of images to analyze for statistics (None = unlimited)
-    
+        skip_fs_walk: Answer from the database only, without walking the
+            filesystem (file/subfolder/size counts come back as None)
+        root_stat: Stat result for folder_path if the caller already has
+            one, avoiding a duplicate stat syscall here
+        conn: Database connection to reuse (defaults to this thread's)
+
     Returns:
         Dictionary with all statistics
     """
     folder_path = os.path.normpath(folder_path)
-    
-    if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
+
+    if root_stat is None:
+        try:
+            root_stat = os.stat(folder_path)
+        except OSError:
+            raise ValueError(f"Invalid folder path: {folder_path}")
+    if not stat_module.S_ISDIR(root_stat.st_mode):
         raise ValueError(f"Invalid folder path: {folder_path}")
-    
-    conn = DataBase.get_conn()
-    
-    # Always compute file/folder counts (no limit)
-    counts = get_file_and_folder_counts(folder_path, recursive)
-    
+
+    if conn is None:
+        conn = DataBase.get_conn()
+
+    # Single shared fetch feeding all DB-based stats below
+    rows = _fetch_folder_image_rows(conn, folder_path, recursive, analysis_limit)
+
     # Media stats with limit
-    media_stats = get_media_stats(conn, folder_path, recursive, analysis_limit)
-    
-    # Tag analysis with limit
+    media_stats = get_media_stats(conn, folder_path, recursive, analysis_limit, rows=rows)
+
+    if skip_fs_walk:
+        # DB is the source of truth for media counts; skipping the walk
+        # keeps the whole computation off the disk (valuable on network
+        # mounts, where the walk is a stat storm)
+        counts = {
+            "file_count": None,
+            "subfolder_count": None,
+            "total_size_bytes": None,
+            "media_file_count": media_stats["indexed_media"],
+        }
+    else:
+        # Full file/folder counts (no limit)
+        counts = get_file_and_folder_counts(folder_path, recursive)
+
+    # Tag analysis with limit (aggregated fully in SQL)
     top_tags = get_top_tags(conn, folder_path, recursive, limit=10, max_images=analysis_limit)
-    
+
+    # Prompt/metadata analysis must spend the limit on exif-bearing rows;
+    # sharing the unfiltered fetch would let uncaptioned images consume
+    # the whole budget on mixed libraries. Without a limit the shared rows
+    # already contain every captioned image, so no second query is needed.
+    if analysis_limit:
+        analysis_rows = _fetch_folder_image_rows(
+            conn, folder_path, recursive, analysis_limit, exif_only=True
+        )
+    else:
+        analysis_rows = rows
+
     # Prompt analysis with limit
-    prompt_analysis = analyze_prompt_words(conn, folder_path, recursive, limit=20, max_images=analysis_limit)
-    
+    prompt_analysis = analyze_prompt_words(conn, folder_path, recursive, limit=20, max_images=analysis_limit, rows=analysis_rows)
+
     # Metadata summary with limit (only if requested)
     metadata_summary = {}
     if include_metadata:
-        metadata_summary = get_metadata_summary(conn, folder_path, recursive, max_images=analysis_limit)
+        metadata_summary = get_metadata_summary(conn, folder_path, recursive, max_images=analysis_limit, rows=analysis_rows)
     
     return {
         "folder_path": folder_path,
@@ -586,7 +721,9 @@ def get_cached_or_compute_stats(
     recursive: bool = True,
     force_refresh: bool = False,
     include_metadata: bool = True,
-    analysis_limit: Optional[int] = None
+    analysis_limit: Optional[int] = None,
+    root_stat: Optional[os.stat_result] = None,
+    conn=None
 ) -> Dict:
     """
     Get folder statistics from cache or compute if needed.
@@ -597,12 +734,15 @@ def get_cached_or_compute_stats(
         force_refresh: Force recomputation even if cache is valid
         include_metadata: Whether to include detailed metadata
         analysis_limit: Maximum number of images to analyze
-    
+        root_stat: Stat result for folder_path if the caller already has one
+        conn: Database connection to reuse (defaults to this thread's)
+
     Returns:
         Dictionary with statistics and cache info
     """
     folder_path = os.path.normpath(folder_path)
-    conn = DataBase.get_conn()
+    if conn is None:
+        conn = DataBase.get_conn()
     
     # Check cache validity
     cache_expired = FolderStats.is_cache_expired(conn, folder_path)
@@ -618,23 +758,78 @@ def get_cached_or_compute_stats(
                 "cache_valid": True
             }
             return result
-    
-    # Compute fresh statistics
-    stats = compute_folder_stats(folder_path, recursive, include_metadata, analysis_limit)
-    
-    # Cache the results
+
+    # Coalesce concurrent computations of the same folder: membership check
+    # and reservation happen under one lock acquisition, so duplicate
+    # requests can't slip through between a check and an insert
+    if not force_refresh:
+        with _inflight_lock:
+            done_event = _inflight_computes.get(folder_path)
+            is_owner = done_event is None
+            if is_owner:
+                done_event = threading.Event()
+                _inflight_computes[folder_path] = done_event
+
+        if not is_owner:
+            # Another thread is computing this folder; reuse its result.
+            # The timeout is a safety net against an owner that vanished
+            # without releasing its slot — better to duplicate one compute
+            # than to block this request forever
+            if done_event.wait(timeout=_INFLIGHT_WAIT_TIMEOUT):
+                cached = FolderStats.get_cached_stats(conn, folder_path)
+                if cached:
+                    result = cached["stats"]
+                    result["cache_info"] = {
+                        "is_cached": True,
+                        "computed_at": cached["computed_at"],
+                        "cache_valid": True
+                    }
+                    return result
+            # Owner failed to cache (or timed out); compute ourselves
+    else:
+        done_event = None
+        is_owner = False
+
+    # Everything after the reservation runs under try/finally: any early
+    # return or exception must release the slot and wake waiters, or every
+    # later request for this folder would block on a never-set event
     try:
-        FolderStats.cache_stats(conn, folder_path, stats)
-        computed_at = stats.get("computed_at")
-    except Exception as e:
-        logger.error(f"Error caching stats for {folder_path}: {e}")
-        computed_at = None
-    
+        if is_owner:
+            # Re-check freshness now that we own the slot: a compute that
+            # finished between the initial cache check and our reservation
+            # would otherwise be repeated in full
+            if not FolderStats.is_cache_expired(conn, folder_path):
+                cached = FolderStats.get_cached_stats(conn, folder_path)
+                if cached:
+                    result = cached["stats"]
+                    result["cache_info"] = {
+                        "is_cached": True,
+                        "computed_at": cached["computed_at"],
+                        "cache_valid": True
+                    }
+                    return result
+
+        # Compute fresh statistics
+        stats = compute_folder_stats(folder_path, recursive, include_metadata, analysis_limit, root_stat=root_stat, conn=conn)
+
+        # Cache the results
+        try:
+            FolderStats.cache_stats(conn, folder_path, stats)
+            computed_at = stats.get("computed_at")
+        except Exception as e:
+            logger.error(f"Error caching stats for {folder_path}: {e}")
+            computed_at = None
+    finally:
+        if is_owner:
+            with _inflight_lock:
+                _inflight_computes.pop(folder_path, None)
+            done_event.set()
+
     # Add cache info
     stats["cache_info"] = {
         "is_cached": False,
         "computed_at": computed_at,
         "cache_valid": True
     }
-    
+
     return stats
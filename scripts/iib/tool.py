@@ -211,32 +211,37 @@ def is_video_simple(filepath):
         # 如果 filetype 模块不可用，使用简单的文件扩展名检查
         return isinstance(get_video_type(filepath), str)
 
+# Extension lookup tables hoisted to module level: the predicates below run
+# once per file inside walk/count loops, so they shouldn't rebuild their
+# candidate lists on every call
+VIDEO_EXTENSIONS = frozenset(['.mp4', '.m4v', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.ts', '.webm'])
+IMAGE_EXTENSIONS = frozenset(['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.avif', '.jpe'])
+AUDIO_EXTENSIONS = frozenset(['.mp3', '.wav', '.ogg', '.flac', '.m4a', '.aac', '.wma'])
+MEDIA_EXTENSIONS = VIDEO_EXTENSIONS | IMAGE_EXTENSIONS | AUDIO_EXTENSIONS
+
 def get_video_type(file_path):
-    video_extensions = ['.mp4', '.m4v', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.ts', '.webm']
     file_extension = file_path[file_path.rfind('.'):].lower()
 
-    if file_extension in video_extensions:
-        return file_extension[1:] 
+    if file_extension in VIDEO_EXTENSIONS:
+        return file_extension[1:]
     else:
         return None
-    
+
 def is_image_file(filename: str) -> bool:
     if not isinstance(filename, str):
         return False
-    
-    extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.avif', '.jpe']
+
     extension = filename.split('.')[-1].lower()
-    return f".{extension}" in extensions
+    return f".{extension}" in IMAGE_EXTENSIONS
 
 def is_video_file(filename: str) -> bool:
     return isinstance(get_video_type(filename), str) and is_video_simple(filename)
 
 def get_audio_type(file_path):
-    audio_extensions = ['.mp3', '.wav', '.ogg', '.flac', '.m4a', '.aac', '.wma']
     file_extension = file_path[file_path.rfind('.'):].lower()
 
-    if file_extension in audio_extensions:
-        return file_extension[1:] 
+    if file_extension in AUDIO_EXTENSIONS:
+        return file_extension[1:]
     else:
         return None
 